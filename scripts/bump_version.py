@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import mmap
 import re
 import sys
 from pathlib import Path
@@ -13,8 +14,13 @@ ROOT = Path(__file__).resolve().parents[1]
 VERSION_FILE = ROOT / "Config" / "version.json"
 PBXPROJ_FILE = ROOT / "pawWatch.xcodeproj" / "project.pbxproj"
 
-MARKETING_PATTERN = re.compile(r"MARKETING_VERSION = [0-9.]+;")
-BUILD_PATTERN = re.compile(r"CURRENT_PROJECT_VERSION = [0-9]+;")
+# One alternation so both keys are rewritten in a single pass over the file.
+# The value is its own group so the mmap path can patch just the digits.
+# Bytes pattern: the file is ASCII-compatible, so working on raw bytes
+# skips the decode/encode passes entirely.
+VERSION_PATTERN = re.compile(
+    rb"(MARKETING_VERSION = )([0-9.]+)(;)|(CURRENT_PROJECT_VERSION = )([0-9]+)(;)"
+)
 
 
 def load_version() -> dict:
@@ -30,21 +36,76 @@ def save_version(data: dict) -> None:
         handle.write("\n")
 
 
+def _update_pbxproj_inplace(marketing: str, build: int) -> bool:
+    """Patch version digits through mmap without rewriting the file.
+
+    Returns False when any replacement would change the value width, in
+    which case the caller must fall back to a full rewrite.
+    """
+    marketing_b = marketing.encode("ascii")
+    build_b = str(build).encode("ascii")
+    hits = {"marketing": 0, "build": 0}
+    edits: list[tuple[int, int, bytes]] = []
+
+    with PBXPROJ_FILE.open("r+b") as handle, mmap.mmap(handle.fileno(), 0) as mm:
+        for match in VERSION_PATTERN.finditer(mm):
+            if match.group(1) is not None:
+                hits["marketing"] += 1
+                start, end = match.span(2)
+                new_value = marketing_b
+            else:
+                hits["build"] += 1
+                start, end = match.span(5)
+                new_value = build_b
+            if end - start != len(new_value):
+                return False
+            if mm[start:end] != new_value:
+                edits.append((start, end, new_value))
+
+        if hits["marketing"] == 0:
+            raise SystemExit("MARKETING_VERSION not found in project.pbxproj")
+        if hits["build"] == 0:
+            raise SystemExit("CURRENT_PROJECT_VERSION not found in project.pbxproj")
+
+        if not edits:
+            print("project.pbxproj already up to date; skipping write")
+            return True
+
+        for start, end, new_value in edits:
+            mm[start:end] = new_value
+        mm.flush()
+    return True
+
+
 def update_pbxproj(marketing: str, build: int) -> None:
     if not PBXPROJ_FILE.exists():
         raise SystemExit(f"project.pbxproj missing: {PBXPROJ_FILE}")
 
-    text = PBXPROJ_FILE.read_text()
+    if _update_pbxproj_inplace(marketing, build):
+        return
+
+    # Value width changed (e.g. 1.0.99 -> 1.0.100); rewrite the file.
+    raw = PBXPROJ_FILE.read_bytes()
+    marketing_b = marketing.encode("ascii")
+    build_b = str(build).encode("ascii")
+
+    hits = {"marketing": 0, "build": 0}
+
+    def repl(match: re.Match[bytes]) -> bytes:
+        if match.group(1) is not None:
+            hits["marketing"] += 1
+            return match.group(1) + marketing_b + match.group(3)
+        hits["build"] += 1
+        return match.group(4) + build_b + match.group(6)
 
-    text, marketing_hits = MARKETING_PATTERN.subn(f"MARKETING_VERSION = {marketing};", text)
-    text, build_hits = BUILD_PATTERN.subn(f"CURRENT_PROJECT_VERSION = {build};", text)
+    new_raw = VERSION_PATTERN.sub(repl, raw)
 
-    if marketing_hits == 0:
+    if hits["marketing"] == 0:
         raise SystemExit("MARKETING_VERSION not found in project.pbxproj")
-    if build_hits == 0:
+    if hits["build"] == 0:
         raise SystemExit("CURRENT_PROJECT_VERSION not found in project.pbxproj")
 
-    PBXPROJ_FILE.write_text(text)
+    PBXPROJ_FILE.write_bytes(new_raw)
 
 
 def parse_set_version(raw: str) -> tuple[int, int, int]:
@@ -82,12 +143,14 @@ def main(argv: list[str] | None = None) -> int:
     else:
         patch += 1
 
+    version_dirty = (major, minor, patch) != (data["major"], data["minor"], data["patch"])
     data.update({"major": major, "minor": minor, "patch": patch})
 
     marketing = f"{major}.{minor}.{patch}"
     build = max(patch, 1)
 
-    save_version(data)
+    if version_dirty:
+        save_version(data)
     update_pbxproj(marketing, build)
 
     print(f"Updated version to {marketing} (build {build})")
@@ -22,35 +22,90 @@ from __future__ import annotations
 import argparse
 import csv
 import math
-from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from statistics import mean
-from typing import Iterable, List, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 import xml.etree.ElementTree as ET
 
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy is optional; fall back to brute force below
+    cKDTree = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; only used when SciPy is absent
+    njit = None
+    prange = range
+
 
 R_EARTH_M = 6_371_000.0
 
 
-@dataclass(frozen=True)
-class TrackPoint:
-    timestamp: Optional[datetime]
-    seconds: Optional[float]
-    lat: float
-    lon: float
+@dataclass(frozen=True, slots=True)
+class Track:
+    """Structure-of-arrays view of one GPX track.
+
+    ``lats_rad``/``lons_rad`` are the coordinates pre-converted to
+    radians so the matchers never re-convert per pair. ``secs`` holds
+    POSIX seconds with NaN where a point has no <time>.
+    """
+
+    lats: np.ndarray
+    lons: np.ndarray
+    lats_rad: np.ndarray
+    lons_rad: np.ndarray
+    secs: np.ndarray
+
+    def __len__(self) -> int:
+        return self.lats.shape[0]
+
+
+@dataclass(frozen=True, slots=True)
+class MatchResult:
+    """Matched point pairs as parallel index/distance arrays."""
+
+    base_idx: np.ndarray
+    test_idx: np.ndarray
+    dist: np.ndarray
+
+    def __len__(self) -> int:
+        return self.dist.shape[0]
+
+
+_EMPTY_MATCHES = MatchResult(
+    np.empty(0, dtype=np.intp),
+    np.empty(0, dtype=np.intp),
+    np.empty(0),
+)
 
 
 def _local(tag: str) -> str:
     return tag.rsplit("}", 1)[-1] if "}" in tag else tag
 
 
+@lru_cache(maxsize=8192)
 def _parse_time(raw: Optional[str]) -> Optional[datetime]:
     if not raw:
         return None
     text = raw.strip()
     if not text:
         return None
+    # Fast path for the fixed layouts GPX writers almost always emit:
+    # YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS.fffZ.
+    if text[-1] in "Zz" and (len(text) == 20 or (len(text) == 24 and text[19] == ".")):
+        try:
+            micro = int(text[20:23]) * 1000 if len(text) == 24 else 0
+            return datetime(
+                int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                int(text[11:13]), int(text[14:16]), int(text[17:19]),
+                micro, tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
     if text.endswith("Z") or text.endswith("z"):
         text = text[:-1] + "+00:00"
     try:
@@ -64,149 +119,231 @@ def _parse_time(raw: Optional[str]) -> Optional[datetime]:
     return dt
 
 
-def parse_gpx(path: str) -> List[TrackPoint]:
-    tree = ET.parse(path)
-    root = tree.getroot()
-    pts: List[TrackPoint] = []
-    for trkpt in root.findall(".//{*}trkpt"):
-        lat_s = trkpt.get("lat")
-        lon_s = trkpt.get("lon")
+def parse_gpx(path: str) -> Track:
+    lats: List[float] = []
+    lons: List[float] = []
+    times: List[Optional[datetime]] = []
+    root: Optional[ET.Element] = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end" or _local(elem.tag) != "trkpt":
+            continue
+        lat_s = elem.get("lat")
+        lon_s = elem.get("lon")
         if lat_s is None or lon_s is None:
+            elem.clear()
             continue
         try:
             lat = float(lat_s)
             lon = float(lon_s)
         except ValueError:
+            elem.clear()
             continue
         timestamp: Optional[datetime] = None
-        for child in trkpt:
+        for child in elem:
             if _local(child.tag) == "time":
                 timestamp = _parse_time(child.text)
                 break
-        seconds = timestamp.timestamp() if timestamp else None
-        pts.append(TrackPoint(timestamp, seconds, lat, lon))
-    return pts
-
-
-def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    lat1_r, lon1_r = math.radians(lat1), math.radians(lon1)
-    lat2_r, lon2_r = math.radians(lat2), math.radians(lon2)
-    dlat = lat2_r - lat1_r
-    dlon = lon2_r - lon1_r
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon / 2) ** 2)
-    return R_EARTH_M * 2 * math.asin(min(1.0, math.sqrt(a)))
-
-
-def match_by_time(
-    base: Sequence[TrackPoint],
-    test: Sequence[TrackPoint],
-    epsilon: float,
-) -> List[Tuple[TrackPoint, TrackPoint, float]]:
-    base_t = [p for p in base if p.seconds is not None]
-    test_t = [p for p in test if p.seconds is not None]
-    if not base_t or not test_t:
-        return []
-    base_t.sort(key=lambda p: p.seconds)  # type: ignore[arg-type]
-    test_t.sort(key=lambda p: p.seconds)  # type: ignore[arg-type]
-    test_secs = [p.seconds for p in test_t]  # type: ignore[list-item]
-
-    matches: List[Tuple[TrackPoint, TrackPoint, float]] = []
-    for b in base_t:
-        sec = b.seconds  # type: ignore[assignment]
-        idx = bisect_left(test_secs, sec)
-        candidates = []
-        if idx < len(test_t):
-            candidates.append(test_t[idx])
-        if idx > 0:
-            candidates.append(test_t[idx - 1])
-        if not candidates:
-            continue
-        winner = min(candidates, key=lambda p: abs(p.seconds - sec))  # type: ignore[arg-type]
-        if abs(winner.seconds - sec) <= epsilon:  # type: ignore[operator]
-            dist = haversine_m(b.lat, b.lon, winner.lat, winner.lon)
-            matches.append((b, winner, dist))
-    return matches
-
-
-def match_by_spatial(
-    base: Sequence[TrackPoint],
-    test: Sequence[TrackPoint],
-) -> List[Tuple[TrackPoint, TrackPoint, float]]:
-    if not base or not test:
-        return []
-    matches: List[Tuple[TrackPoint, TrackPoint, float]] = []
-    test_rad = [(math.radians(p.lat), math.radians(p.lon), p) for p in test]
-    for b in base:
-        lat1 = math.radians(b.lat)
-        lon1 = math.radians(b.lon)
+        lats.append(lat)
+        lons.append(lon)
+        times.append(timestamp)
+        elem.clear()
+    if root is not None:
+        root.clear()
+    secs = np.asarray(
+        [t.timestamp() if t is not None else math.nan for t in times],
+        dtype=np.float64,
+    )
+    lats_arr = np.asarray(lats, dtype=np.float64)
+    lons_arr = np.asarray(lons, dtype=np.float64)
+    return Track(
+        lats_arr,
+        lons_arr,
+        np.radians(lats_arr),
+        np.radians(lons_arr),
+        secs,
+    )
+
+
+def haversine_np(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """Great-circle distance in meters for radian arrays (broadcasting)."""
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return R_EARTH_M * 2 * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def _chronological(idx: np.ndarray, secs: np.ndarray) -> np.ndarray:
+    """Order indices by timestamp, skipping the sort when already sorted.
+
+    GPX tracks are almost always stored chronologically, so the O(N)
+    monotonicity check usually saves the O(N log N) argsort.
+    """
+    vals = secs[idx]
+    if vals.size > 1 and not np.all(np.diff(vals) >= 0):
+        idx = idx[np.argsort(vals)]
+    return idx
+
+
+def match_by_time(base: Track, test: Track, epsilon: float) -> MatchResult:
+    base_ok = np.flatnonzero(~np.isnan(base.secs))
+    test_ok = np.flatnonzero(~np.isnan(test.secs))
+    if base_ok.size == 0 or test_ok.size == 0:
+        return _EMPTY_MATCHES
+    base_ok = _chronological(base_ok, base.secs)
+    test_ok = _chronological(test_ok, test.secs)
+    base_secs = base.secs[base_ok]
+    test_secs = test.secs[test_ok]
+
+    # For each base timestamp pick the nearer of its two sorted neighbors.
+    idx = np.searchsorted(test_secs, base_secs)
+    idx_lo = np.clip(idx - 1, 0, test_secs.size - 1)
+    idx_hi = np.clip(idx, 0, test_secs.size - 1)
+    d_lo = np.abs(test_secs[idx_lo] - base_secs)
+    d_hi = np.abs(test_secs[idx_hi] - base_secs)
+    winner = np.where(d_lo <= d_hi, idx_lo, idx_hi)
+
+    good = np.abs(test_secs[winner] - base_secs) <= epsilon
+    b_idx = base_ok[good]
+    t_idx = test_ok[winner[good]]
+    dists = haversine_np(base.lats_rad[b_idx], base.lons_rad[b_idx],
+                         test.lats_rad[t_idx], test.lons_rad[t_idx])
+    return MatchResult(b_idx, t_idx, dists)
+
+
+def _unit_xyz(lat_rad: np.ndarray, lon_rad: np.ndarray) -> np.ndarray:
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack([
+        cos_lat * np.cos(lon_rad),
+        cos_lat * np.sin(lon_rad),
+        np.sin(lat_rad),
+    ])
+
+
+def _nearest_kernel(
+    base_lat: np.ndarray,
+    base_lon: np.ndarray,
+    test_lat: np.ndarray,
+    test_lon: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """O(N*M) nearest-neighbor scan over radian arrays.
+
+    Written with scalar math so Numba can compile it to native code;
+    jitted lazily in match_by_spatial when Numba is available.
+    """
+    n = base_lat.shape[0]
+    m = test_lat.shape[0]
+    t_idx = np.empty(n, dtype=np.intp)
+    dists = np.empty(n, dtype=np.float64)
+    cos_test_lat = np.cos(test_lat)
+    for i in prange(n):
+        lat1 = base_lat[i]
+        lon1 = base_lon[i]
         cos_lat1 = math.cos(lat1)
-        best = float("inf")
-        best_point: Optional[TrackPoint] = None
-        for lat2, lon2, tp in test_rad:
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
+        best = math.inf
+        best_j = 0
+        for j in range(m):
+            dlat = test_lat[j] - lat1
+            dlon = test_lon[j] - lon1
             a = (math.sin(dlat / 2) ** 2 +
-                 cos_lat1 * math.cos(lat2) * math.sin(dlon / 2) ** 2)
-            dist = R_EARTH_M * 2 * math.asin(min(1.0, math.sqrt(a)))
-            if dist < best:
-                best = dist
-                best_point = tp
-        if best_point is not None:
-            matches.append((b, best_point, best))
-    return matches
-
-
-def percentile(sorted_vals: Sequence[float], pct: float) -> float:
-    if not sorted_vals:
-        return float("nan")
-    if pct <= 0:
-        return sorted_vals[0]
-    if pct >= 100:
-        return sorted_vals[-1]
-    rank = math.ceil(pct / 100 * len(sorted_vals)) - 1
-    rank = min(max(rank, 0), len(sorted_vals) - 1)
-    return sorted_vals[rank]
+                 cos_lat1 * cos_test_lat[j] * math.sin(dlon / 2) ** 2)
+            d = math.asin(min(1.0, math.sqrt(a)))
+            if d < best:
+                best = d
+                best_j = j
+        t_idx[i] = best_j
+        dists[i] = R_EARTH_M * 2 * best
+    return t_idx, dists
+
+
+_nearest_kernel_jit = None
+
+
+def _match_by_spatial_numba(base: Track, test: Track) -> MatchResult:
+    global _nearest_kernel_jit
+    if _nearest_kernel_jit is None:
+        _nearest_kernel_jit = njit(parallel=True, fastmath=True)(_nearest_kernel)
+    t_idx, dists = _nearest_kernel_jit(
+        base.lats_rad, base.lons_rad,
+        test.lats_rad, test.lons_rad,
+    )
+    return MatchResult(np.arange(len(base), dtype=np.intp), t_idx, dists)
+
+
+# Budget for one tile's M-wide float64 intermediates; sized to keep the
+# broadcasted distance block resident in a typical 256 KiB+ L2 cache.
+_TILE_BUDGET_BYTES = 256 * 1024
+
+
+def _match_by_spatial_brute(base: Track, test: Track) -> MatchResult:
+    m = len(test)
+    tile = min(len(base), max(1, _TILE_BUDGET_BYTES // (m * 8)))
+    t_idx = np.empty(len(base), dtype=np.intp)
+    dists = np.empty(len(base), dtype=np.float64)
+    for i0 in range(0, len(base), tile):
+        i1 = min(i0 + tile, len(base))
+        dist = haversine_np(base.lats_rad[i0:i1, None], base.lons_rad[i0:i1, None],
+                            test.lats_rad[None, :], test.lons_rad[None, :])
+        nearest = dist.argmin(axis=1)
+        t_idx[i0:i1] = nearest
+        dists[i0:i1] = dist[np.arange(i1 - i0), nearest]
+    return MatchResult(np.arange(len(base), dtype=np.intp), t_idx, dists)
+
+
+def match_by_spatial(base: Track, test: Track) -> MatchResult:
+    if len(base) == 0 or len(test) == 0:
+        return _EMPTY_MATCHES
+    if cKDTree is None:
+        if njit is not None:
+            return _match_by_spatial_numba(base, test)
+        return _match_by_spatial_brute(base, test)
+
+    tree = cKDTree(_unit_xyz(test.lats_rad, test.lons_rad))
+    d_chord, idx = tree.query(_unit_xyz(base.lats_rad, base.lons_rad), k=1)
+    # Chord length on the unit sphere back to great-circle distance.
+    arc = 2 * R_EARTH_M * np.arcsin(np.minimum(1.0, d_chord / 2))
+    return MatchResult(
+        np.arange(len(base), dtype=np.intp),
+        np.asarray(idx, dtype=np.intp),
+        arc,
+    )
 
 
 def summarize(distances: Sequence[float]) -> Tuple[int, float, float, float, float]:
-    n = len(distances)
-    if n == 0:
+    arr = np.asarray(distances, dtype=np.float64)
+    if arr.size == 0:
         nan = float("nan")
         return (0, nan, nan, nan, nan)
-    vals = sorted(distances)
-    mid = n // 2
-    if n % 2:
-        median = vals[mid]
-    else:
-        median = 0.5 * (vals[mid - 1] + vals[mid])
     return (
-        n,
-        median,
-        percentile(vals, 90.0),
-        vals[-1],
-        mean(vals),
+        int(arr.size),
+        float(np.median(arr)),
+        float(np.percentile(arr, 90.0)),
+        float(arr.max()),
+        float(arr.mean()),
     )
 
 
-def isoformat_z(dt: Optional[datetime]) -> str:
-    if dt is None:
-        return ""
-    dt = dt.astimezone(timezone.utc).replace(microsecond=0)
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+def write_csv(base: Track, matches: MatchResult, path: str) -> None:
+    secs = base.secs[matches.base_idx]
+    valid = ~np.isnan(secs)
+    ts = np.zeros(secs.shape, dtype="datetime64[s]")
+    ts[valid] = secs[valid].astype(np.int64).astype("datetime64[s]")
+    ts_str = np.datetime_as_string(ts, unit="s", timezone="UTC")
+    ts_str[~valid] = ""  # points without <time> keep an empty cell
 
+    lat_str = np.char.mod("%.7f", base.lats[matches.base_idx])
+    lon_str = np.char.mod("%.7f", base.lons[matches.base_idx])
+    dist_str = np.char.mod("%.3f", matches.dist)
 
-def write_csv(matches: Iterable[Tuple[TrackPoint, TrackPoint, float]], path: str) -> None:
     with open(path, "w", newline="") as handle:
         writer = csv.writer(handle)
         writer.writerow(["timestamp", "lat", "lon", "error_m"])
-        for base, _test, dist in matches:
-            writer.writerow([
-                isoformat_z(base.timestamp),
-                f"{base.lat:.7f}",
-                f"{base.lon:.7f}",
-                f"{dist:.3f}",
-            ])
+        writer.writerows(zip(ts_str, lat_str, lon_str, dist_str))
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -240,8 +377,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     else:
         matches = match_by_time(baseline, test, args.epsilon_sec)
 
-    distances = [d for _b, _t, d in matches]
-    count, median, p90, max_val, avg = summarize(distances)
+    count, median, p90, max_val, avg = summarize(matches.dist)
 
     if count == 0:
         print("No matched points found.")
@@ -254,7 +390,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     print(f"Mean: {avg:.2f} m")
 
     if args.csv_path:
-        write_csv(matches, args.csv_path)
+        write_csv(baseline, matches, args.csv_path)
         print(f"CSV written to {args.csv_path}")
 
     return 0
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Shared helpers for patching pawWatch.xcodeproj/project.pbxproj.
+
+The add_watch_target* scripts each reimplemented UUID generation,
+file read/write, and sequential regex rewrites. This module gives them
+one implementation: a list of Patch anchors applied in a single
+alternation pass over the project text.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+_READ_CHUNK = 1 << 20
+
+
+def generate_xcode_uuid() -> str:
+    """Generate a 24-character uppercase hex UUID for Xcode objects."""
+    return uuid.uuid4().hex.upper()[:24]
+
+
+def read_pbxproj(path: str) -> bytes:
+    """Read the project file as raw bytes (it is ASCII-compatible)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def write_pbxproj(path: str, content: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(content)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+@dataclass(frozen=True)
+class Patch:
+    """One anchor rewrite: regex source plus the literal replacement."""
+
+    name: str
+    pattern: bytes
+    replacement: bytes
+
+
+def apply_patches(content: bytes, patches: Sequence[Patch]) -> Tuple[bytes, Dict[str, int]]:
+    """Apply all patches in one pass; returns (new_content, hit counts)."""
+    by_name = {p.name: p for p in patches}
+    combined = re.compile(
+        b"|".join(
+            b"(?P<" + p.name.encode("ascii") + b">" + p.pattern + b")"
+            for p in patches
+        )
+    )
+    hits = {p.name: 0 for p in patches}
+
+    def repl(match: re.Match) -> bytes:
+        hits[match.lastgroup] += 1
+        return by_name[match.lastgroup].replacement
+
+    return combined.sub(repl, content), hits
+
+
+def patch_pbxproj(path: str, patches: Sequence[Patch]) -> Dict[str, int]:
+    """Rewrite the project file in place; returns per-patch hit counts."""
+    content = read_pbxproj(path)
+    new_content, hits = apply_patches(content, patches)
+    if new_content != content:
+        write_pbxproj(path, new_content)
+    return hits